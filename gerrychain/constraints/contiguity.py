@@ -2,6 +2,9 @@ from heapq import heappop, heappush
 from itertools import count
 
 import networkx as nx
+import numpy
+import scipy.sparse
+import scipy.sparse.csgraph
 from typing import Callable, Any, Dict, Set
 from ..partition import Partition
 import random
@@ -194,16 +197,38 @@ def contiguous_bfs(partition: Partition) -> bool:
     """
     parts_to_check = affected_parts(partition)
 
-    # Generates a subgraph for each district and perform a BFS on it
-    # to check connectedness.
+    # Searches each district directly on the adjacency arrays of the graph,
+    # without building a NetworkX subgraph for it.
     for part in parts_to_check:
-        adj = nx.to_dict_of_lists(partition.subgraphs[part])
-        if _bfs(adj) is False:
+        if not _part_is_connected(partition.subgraphs.adjacency_view(part)):
             return False
 
     return True
 
 
+def _part_is_connected(view) -> bool:
+    """
+    :param view: The adjacency view of one part of a partition.
+    :type view: :class:`~gerrychain.partition.subgraphs.PartAdjacencyView`
+
+    :returns: Whether the subgraph induced by the part is connected.
+    :rtype: bool
+    """
+    n = len(view)
+    if n <= 1:
+        return True
+    rows, cols = view.local_edges()
+    adjacency = scipy.sparse.csr_array(
+        (numpy.ones(len(rows), dtype=numpy.int8), (rows, cols)), shape=(n, n)
+    )
+    return (
+        scipy.sparse.csgraph.connected_components(
+            adjacency, directed=False, return_labels=False
+        )
+        == 1
+    )
+
+
 def number_of_contiguous_parts(partition: Partition) -> int:
     """
     :param partition: Instance of Partition; contains connected components.
@@ -212,8 +237,22 @@ def number_of_contiguous_parts(partition: Partition) -> int:
     :returns: Number of contiguous parts in the partition.
     :rtype: int
     """
-    parts = partition.assignment.parts
-    return sum(1 for part in parts if nx.is_connected(partition.subgraphs[part]))
+    indptr, indices = partition.graph.adjacency_csr()
+    labels = partition.assignment_array
+    # Keep only the edges inside a part, so that every connected component
+    # of what remains lies in a single part, and label all of them at once.
+    rows = numpy.repeat(numpy.arange(len(labels)), numpy.diff(indptr))
+    inside = labels[rows] == labels[indices]
+    adjacency = scipy.sparse.csr_array(
+        (numpy.ones(inside.sum(), dtype=numpy.int8), (rows[inside], indices[inside])),
+        shape=(len(labels), len(labels)),
+    )
+    _, components = scipy.sparse.csgraph.connected_components(
+        adjacency, directed=False
+    )
+    # A part is connected when all of its nodes share one component
+    part_components = numpy.unique(numpy.stack([labels, components]), axis=1)[0]
+    return int((numpy.bincount(part_components) == 1).sum())
 
 
 # Create an instance of SelfConfiguringLowerBound using the number_of_contiguous_parts function.
@@ -239,36 +278,3 @@ def contiguous_components(partition: Partition) -> Dict[int, list]:
         part: [subgraph.subgraph(nodes) for nodes in nx.connected_components(subgraph)]
         for part, subgraph in partition.subgraphs.items()
     }
-
-
-def _bfs(graph: Dict[int, list]) -> bool:
-    """
-    Performs a breadth-first search on the provided graph and returns True or
-    False depending on whether the graph is connected.
-
-    :param graph: Dict-of-lists; an adjacency matrix.
-    :type graph: Dict[int, list]
-
-    :returns: is this graph connected?
-    :rtype: bool
-    """
-    q = [next(iter(graph))]
-    visited = set()
-    total_vertices = len(graph)
-
-    # Check if the district has a single vertex. If it does, then simply return
-    # `True`, as it's trivially connected.
-    if total_vertices <= 1:
-        return True
-
-    # bfs!
-    while len(q) > 0:
-        current = q.pop(0)
-        neighbors = graph[current]
-
-        for neighbor in neighbors:
-            if neighbor not in visited:
-                visited.add(neighbor)
-                q += [neighbor]
-
-    return total_vertices == len(visited)
@@ -80,10 +80,27 @@ def intersections_with_neighbors(geometries):
     :returns: A generator yielding tuples of the form (id, {neighbor_id: intersection})
     :rtype: Generator
     """
+    # Each intersection is computed once per pair and kept until the
+    # neighbor comes around to need it, since a ∩ b == b ∩ a. This trades
+    # half of the intersection computations for memory: the pending
+    # geometries are those of every pair whose second geometry has not been
+    # visited yet, which for typical geographic orderings is a band of
+    # O(sqrt(|V|) * degree) pairs and at worst O(|E|). Pairs that will not be
+    # revisited (the neighbor was already visited, or this geometry is empty
+    # and so is not anyone's neighbor) are not kept.
+    computed = {}
+    visited = set()
     for i, neighbors in neighboring_geometries(geometries):
-        intersections = {
-            j: geometries[i].intersection(geometries[j]) for j in neighbors
-        }
+        visited.add(i)
+        keep = not geometries[i].is_empty
+        intersections = {}
+        for j in neighbors:
+            if (j, i) in computed:
+                intersections[j] = computed.pop((j, i))
+            else:
+                intersections[j] = geometries[i].intersection(geometries[j])
+                if keep and j not in visited:
+                    computed[(i, j)] = intersections[j]
         yield (i, intersections)
 
 
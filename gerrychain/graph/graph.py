@@ -17,13 +17,14 @@ from typing import Any
 import warnings
 
 import networkx
+import numpy
 from networkx.classes.function import frozen
 from networkx.readwrite import json_graph
 import pandas as pd
 
 from .adjacency import neighbors
 from .geo import GeometryError, invalid_geometries, reprojected
-from typing import List, Iterable, Optional, Set, Tuple, Union
+from typing import Dict, List, Iterable, Optional, Set, Tuple, Union
 
 
 def json_serialize(input_object: Any) -> Optional[int]:
@@ -519,12 +520,24 @@ class FrozenGraph:
     :ivar size: The number of nodes in the graph.
     :type size: int
 
+    Node attributes can also be read as whole columns with :meth:`field_array`,
+    whose entries are ordered like the nodes in :meth:`node_index`.
+
     Note
     ----
     The class uses `__slots__` for improved memory efficiency.
     """
 
-    __slots__ = ["graph", "size"]
+    __slots__ = [
+        "graph",
+        "size",
+        "_node_index",
+        "_node_list",
+        "_columns",
+        "_lookups",
+        "_csr",
+        "_weights",
+    ]
 
     def __init__(self, graph: Graph) -> None:
         """
@@ -540,6 +553,12 @@ class FrozenGraph:
         self.graph.add_data = frozen
 
         self.size = len(self.graph)
+        self._node_index = None
+        self._node_list = None
+        self._columns = {}
+        self._lookups = {}
+        self._csr = None
+        self._weights = {}
 
     def __len__(self) -> int:
         return self.size
@@ -572,9 +591,123 @@ class FrozenGraph:
     def degree(self, n: Any) -> int:
         return self.graph.degree(n)
 
-    @functools.lru_cache(65536)
     def lookup(self, node: Any, field: str) -> Any:
-        return self.graph.nodes[node][field]
+        """
+        Lookup a node/field attribute. The attribute is read from a per-field
+        ``{node: value}`` dictionary built on first use, rather than from the
+        attribute dictionary of each node.
+
+        :param node: Node to look up.
+        :type node: Any
+        :param field: Field to look up.
+        :type field: str
+
+        :returns: The value of the attribute `field` at `node`.
+        :rtype: Any
+        """
+        try:
+            return self._lookups[field][node]
+        except KeyError:
+            if field in self._lookups:
+                raise
+        self._lookups[field] = {
+            n: data[field] for n, data in self.graph.nodes.items() if field in data
+        }
+        return self._lookups[field][node]
+
+    def node_index(self) -> Dict[Any, int]:
+        """
+        :returns: A dictionary mapping each node to its position in the
+            columns returned by :meth:`field_array`.
+        :rtype: Dict[Any, int]
+        """
+        if self._node_index is None:
+            self._node_list = list(self.graph.nodes)
+            self._node_index = {node: i for i, node in enumerate(self._node_list)}
+        return self._node_index
+
+    def node_list(self) -> List[Any]:
+        """
+        :returns: The nodes of the graph, ordered by their position in
+            :meth:`node_index`.
+        :rtype: List[Any]
+        """
+        self.node_index()
+        return self._node_list
+
+    def adjacency_csr(self) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        The adjacency structure of the graph in compressed sparse row form:
+        the positions of the neighbors of the node at position ``i`` are
+        ``indices[indptr[i]:indptr[i + 1]]``. Positions are those of
+        :meth:`node_index`.
+
+        :returns: The ``(indptr, indices)`` arrays.
+        :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+        """
+        if self._csr is None:
+            node_index = self.node_index()
+            adj = self.graph.adj
+            nodes = self._node_list
+            indptr = numpy.zeros(len(nodes) + 1, dtype=numpy.intp)
+            numpy.cumsum([len(adj[node]) for node in nodes], out=indptr[1:])
+            indices = numpy.fromiter(
+                (node_index[neighbor] for node in nodes for neighbor in adj[node]),
+                dtype=numpy.intp,
+                count=indptr[-1],
+            )
+            indptr.flags.writeable = False
+            indices.flags.writeable = False
+            self._csr = (indptr, indices)
+        return self._csr
+
+    def adjacency_weights(self, attribute: str = "weight") -> Optional[numpy.ndarray]:
+        """
+        The values of an edge attribute, aligned with the ``indices`` array of
+        :meth:`adjacency_csr`. Edges without the attribute count as 1, as in
+        :func:`networkx.laplacian_matrix`.
+
+        :param attribute: The name of the edge attribute. Default is "weight".
+        :type attribute: str, optional
+
+        :returns: A read-only array of the attribute values, or None if no
+            edge has the attribute.
+        :rtype: Optional[numpy.ndarray]
+        """
+        if attribute not in self._weights:
+            indptr, _ = self.adjacency_csr()
+            adj = self.graph.adj
+            nodes = self._node_list
+            weights = None
+            if any(attribute in data for _, _, data in self.graph.edges(data=True)):
+                weights = numpy.fromiter(
+                    (
+                        data.get(attribute, 1)
+                        for node in nodes
+                        for data in adj[node].values()
+                    ),
+                    dtype=float,
+                    count=indptr[-1],
+                )
+                weights.flags.writeable = False
+            self._weights[attribute] = weights
+        return self._weights[attribute]
+
+    def field_array(self, field: str) -> numpy.ndarray:
+        """
+        :param field: The name of a node attribute.
+        :type field: str
+
+        :returns: A read-only array holding the value of the attribute for
+            every node, in the order given by :meth:`node_index`.
+        :rtype: numpy.ndarray
+        """
+        if field not in self._columns:
+            nodes = self.graph.nodes
+            column = numpy.array([nodes[node][field] for node in self.node_index()])
+            column.flags.writeable = False
+            self._columns[field] = column
+        return self._columns[field]
 
     def subgraph(self, nodes: Iterable[Any]) -> "FrozenGraph":
         return FrozenGraph(self.graph.subgraph(nodes))
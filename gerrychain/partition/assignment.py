@@ -146,9 +146,12 @@ class Assignment(Mapping):
             passed-in dictionary.
         :rtype: Assignment
         """
-        parts = {part: frozenset(keys) for part, keys in level_sets(assignment).items()}
+        mapping = dict(assignment.items())
+        parts = {part: frozenset(keys) for part, keys in level_sets(mapping).items()}
 
-        return cls(parts)
+        # The level sets of a dictionary are disjoint frozensets by
+        # construction, so there is nothing left to validate.
+        return cls(parts, mapping, validate=False)
 
 
 def get_assignment(
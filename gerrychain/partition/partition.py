@@ -1,5 +1,6 @@
 import json
 import networkx
+import numpy
 
 from gerrychain.graph.graph import FrozenGraph, Graph
 from ..updaters import compute_edge_flows, flows_from_changes, cut_edges
@@ -35,6 +36,7 @@ class Partition:
         "flows",
         "edge_flows",
         "_cache",
+        "_assignment_array",
     )
 
     default_updaters = {"cut_edges": cut_edges}
@@ -62,7 +64,10 @@ class Partition:
             self._from_parent(parent, flips)
 
         self._cache = dict()
+        self._assignment_array = None
         self.subgraphs = SubgraphView(self.graph, self.parts)
+        if parent is not None:
+            self.subgraphs.inherit_node_arrays(parent.subgraphs)
 
     @classmethod
     def from_random_assignment(
@@ -219,6 +224,27 @@ class Partition:
     def parts(self):
         return self.assignment.parts
 
+    @property
+    def assignment_array(self) -> numpy.ndarray:
+        """
+        The assignment as an integer array, for vectorized computations over
+        node attribute columns such as :meth:`FrozenGraph.field_array
+        <gerrychain.graph.graph.FrozenGraph.field_array>`.
+
+        :returns: An array holding, for each node in the order given by
+            ``self.graph.node_index()``, the position of its part in
+            ``list(self.parts)``.
+        :rtype: numpy.ndarray
+        """
+        if self._assignment_array is None:
+            node_index = self.graph.node_index()
+            array = numpy.empty(len(node_index), dtype=numpy.intp)
+            for i, nodes in enumerate(self.parts.values()):
+                array[[node_index[node] for node in nodes]] = i
+            array.flags.writeable = False
+            self._assignment_array = array
+        return self._assignment_array
+
     def plot(self, geometries=None, **kwargs):
         """
         Plot the partition, using the provided geometries.
@@ -1,7 +1,124 @@
-from typing import List, Any, Tuple
+from typing import List, Any, Iterator, Optional, Tuple
+import numpy
 from ..graph import Graph
 
 
+class PartAdjacencyView:
+    """
+    A lightweight, read-only view of the subgraph induced by one part of a
+    partition. It only supports iterating over the nodes and querying their
+    neighbors, which it answers from the compressed sparse row adjacency of
+    the parent graph, testing membership by binary search in the sorted
+    positions of the part. Unlike :meth:`SubgraphView.__getitem__`, building
+    it does not copy any NetworkX structures, and its work scales with the
+    size of the part rather than of the graph.
+
+    :ivar graph: The parent (frozen) graph.
+    :type graph: :class:`~gerrychain.graph.graph.FrozenGraph`
+    :ivar positions: The sorted positions of the nodes of the part in
+        ``graph.node_index()``.
+    :type positions: numpy.ndarray
+    """
+
+    __slots__ = ["graph", "positions"]
+
+    def __init__(self, graph, positions: numpy.ndarray) -> None:
+        """
+        :param graph: The parent (frozen) graph.
+        :type graph: :class:`~gerrychain.graph.graph.FrozenGraph`
+        :param positions: The sorted positions of the nodes of the part in
+            ``graph.node_index()``.
+        :type positions: numpy.ndarray
+
+        :returns: None
+        """
+        self.graph = graph
+        self.positions = positions
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __iter__(self) -> Iterator[Any]:
+        nodes = self.graph.node_list()
+        for i in self.positions.tolist():
+            yield nodes[i]
+
+    def __contains__(self, node: Any) -> bool:
+        i = self.graph.node_index().get(node)
+        return i is not None and self._local_positions(numpy.array([i]))[0] >= 0
+
+    def _local_positions(self, positions: numpy.ndarray) -> numpy.ndarray:
+        """
+        :param positions: Positions of nodes in ``graph.node_index()``.
+        :type positions: numpy.ndarray
+
+        :returns: The index in :attr:`positions` of each of the given nodes,
+            or -1 for the nodes that are not in the part.
+        :rtype: numpy.ndarray
+        """
+        local = numpy.searchsorted(self.positions, positions)
+        found = local < len(self.positions)
+        found[found] = self.positions[local[found]] == positions[found]
+        return numpy.where(found, local, -1)
+
+    def neighbor_positions(self, i: int) -> numpy.ndarray:
+        """
+        :param i: The position of a node of the part.
+        :type i: int
+
+        :returns: The positions of the neighbors of that node inside the part.
+        :rtype: numpy.ndarray
+        """
+        indptr, indices = self.graph.adjacency_csr()
+        neighbors = indices[indptr[i]:indptr[i + 1]]
+        return neighbors[self._local_positions(neighbors) >= 0]
+
+    def local_edges(
+        self, data: Optional[numpy.ndarray] = None
+    ) -> Tuple[numpy.ndarray, ...]:
+        """
+        The directed edges (each undirected edge appears in both directions)
+        of the induced subgraph, with nodes numbered by their index in
+        :attr:`positions`.
+
+        :param data: Optional per-edge values aligned with the ``indices``
+            array of ``graph.adjacency_csr()``, such as
+            ``graph.adjacency_weights()``. Default is None.
+        :type data: Optional[numpy.ndarray], optional
+
+        :returns: The ``(rows, cols)`` arrays of the edges, followed by the
+            values of ``data`` for those edges when it is given.
+        :rtype: Tuple[numpy.ndarray, ...]
+        """
+        indptr, indices = self.graph.adjacency_csr()
+        starts = indptr[self.positions]
+        lengths = indptr[self.positions + 1] - starts
+        rows = numpy.repeat(numpy.arange(len(self.positions)), lengths)
+        # Offsets of every entry of the selected CSR rows, without a Python loop
+        offsets = numpy.arange(lengths.sum()) - numpy.repeat(
+            numpy.cumsum(lengths) - lengths, lengths
+        )
+        entries = numpy.repeat(starts, lengths) + offsets
+        cols = self._local_positions(indices[entries])
+
+        inside = cols >= 0
+        if data is None:
+            return rows[inside], cols[inside]
+        return rows[inside], cols[inside], data[entries[inside]]
+
+    def neighbors(self, node: Any) -> List[Any]:
+        """
+        :param node: A node of the part.
+        :type node: Any
+
+        :returns: The neighbors of the node that are in the same part.
+        :rtype: List[Any]
+        """
+        nodes = self.graph.node_list()
+        positions = self.neighbor_positions(self.graph.node_index()[node])
+        return [nodes[i] for i in positions.tolist()]
+
+
 class SubgraphView:
     """
     A view for accessing subgraphs of :class:`Graph` objects.
@@ -17,9 +134,12 @@ class SubgraphView:
     :type parts: List[List[Any]]
     :ivar subgraphs_cache: Cache to store subgraph views for quick access.
     :type subgraphs_cache: Dict
+    :ivar node_arrays_cache: Cache to store the node position arrays returned
+        by :meth:`nodes_array`, along with the node sets they were built from.
+    :type node_arrays_cache: Dict
     """
 
-    __slots__ = ["graph", "parts", "subgraphs_cache"]
+    __slots__ = ["graph", "parts", "subgraphs_cache", "node_arrays_cache"]
 
     def __init__(self, graph: Graph, parts: List[List[Any]]) -> None:
         """
@@ -34,6 +154,7 @@ class SubgraphView:
         self.graph = graph
         self.parts = parts
         self.subgraphs_cache = {}
+        self.node_arrays_cache = {}
 
     def __getitem__(self, part: int) -> Graph:
         """
@@ -48,6 +169,54 @@ class SubgraphView:
             self.subgraphs_cache[part] = self.graph.subgraph(self.parts[part])
         return self.subgraphs_cache[part]
 
+    def nodes_array(self, part: int) -> numpy.ndarray:
+        """
+        :param part: The the id of the partition to return the nodes for.
+        :type part: int
+
+        :returns: The sorted positions (in ``graph.node_index()``) of the nodes
+            of the partition with id `part`, for indexing node attribute
+            columns such as ``graph.field_array(field)``.
+        :rtype: numpy.ndarray
+        """
+        nodes = self.parts[part]
+        cached = self.node_arrays_cache.get(part)
+        if cached is None or cached[0] is not nodes:
+            node_index = self.graph.node_index()
+            positions = numpy.fromiter(
+                (node_index[node] for node in nodes), dtype=numpy.intp, count=len(nodes)
+            )
+            positions.sort()
+            positions.flags.writeable = False
+            cached = self.node_arrays_cache[part] = (nodes, positions)
+        return cached[1]
+
+    def inherit_node_arrays(self, other: "SubgraphView") -> None:
+        """
+        Reuses the node arrays that ``other`` has already computed for parts
+        whose node sets are unchanged, e.g. from the parent partition.
+
+        :param other: Another view over the same graph.
+        :type other: SubgraphView
+
+        :returns: None
+        """
+        for part, cached in other.node_arrays_cache.items():
+            if self.parts.get(part) is cached[0]:
+                self.node_arrays_cache[part] = cached
+
+    def adjacency_view(self, part: int) -> PartAdjacencyView:
+        """
+        :param part: The the id of the partition to return the view for.
+        :type part: int
+
+        :returns: A lightweight view of the subgraph corresponding to the
+            partition with id `part`, for code that only needs to walk its
+            nodes and neighbors.
+        :rtype: PartAdjacencyView
+        """
+        return PartAdjacencyView(self.graph, self.nodes_array(part))
+
     def __iter__(self) -> Graph:
         for part in self.parts:
             yield self[part]
@@ -11,7 +11,7 @@ from .cut_edges import cut_edges, cut_edges_by_part
 from .election import Election
 from .flows import compute_edge_flows, flows_from_changes
 from .tally import DataTally, Tally
-from .spanning_trees import num_spanning_trees
+from .spanning_trees import NumSpanningTrees, log_num_spanning_trees, num_spanning_trees
 
 __all__ = [
     "flows_from_changes",
@@ -30,5 +30,7 @@ __all__ = [
     "compute_edge_flows",
     "Election",
     "num_spanning_trees",
+    "log_num_spanning_trees",
+    "NumSpanningTrees",
     "tally_region_splits",
 ]
@@ -1,22 +1,23 @@
 import collections
 import functools
-from typing import Dict, Set, Tuple, Callable
+import numpy
+from typing import Dict, FrozenSet, List, Tuple, Callable
 
 
 @functools.lru_cache(maxsize=2)
-def neighbor_flips(partition) -> Set[Tuple]:
+def neighbor_flips(partition) -> FrozenSet[Tuple]:
     """
     :param partition: A partition of a Graph
     :type partition: :class:`~gerrychain.partition.Partition`
 
     :returns: The set of edges that were flipped in the given partition.
-    :rtype: Set[Tuple]
+    :rtype: FrozenSet[Tuple]
     """
-    return {
+    return frozenset(
         tuple(sorted((node, neighbor)))
         for node in partition.flips
         for neighbor in partition.graph.neighbors(node)
-    }
+    )
 
 
 def create_flow():
@@ -45,6 +46,38 @@ def flows_from_changes(old_partition, new_partition) -> Dict:
     return flows
 
 
+@functools.lru_cache(maxsize=2)
+def flow_positions(partition) -> Tuple[numpy.ndarray, numpy.ndarray, List]:
+    """
+    The nodes of ``partition.flows`` as arrays of node positions (see
+    :meth:`~gerrychain.graph.graph.FrozenGraph.node_index`), so that every
+    vectorized updater of a step can share one conversion of the flows
+    instead of each hashing the flowing nodes again.
+
+    :param partition: A partition of a Graph with a parent.
+    :type partition: :class:`~gerrychain.partition.Partition`
+
+    :returns: A tuple ``(positions, segments, parts)``. ``positions`` holds the
+        positions of the flowing nodes, grouped by (part, side) with the "in"
+        side of ``parts[i]`` labelled ``2 * i`` and its "out" side
+        ``2 * i + 1`` in ``segments``.
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray, List]
+    """
+    node_index = partition.graph.node_index()
+    parts = list(partition.flows)
+    sides = [
+        partition.flows[part][side] for part in parts for side in ("in", "out")
+    ]
+    sizes = [len(nodes) for nodes in sides]
+    positions = numpy.fromiter(
+        (node_index[node] for nodes in sides for node in nodes),
+        dtype=numpy.intp,
+        count=sum(sizes),
+    )
+    segments = numpy.repeat(numpy.arange(len(sides)), sizes)
+    return positions, segments, parts
+
+
 def on_flow(initializer: Callable, alias: str) -> Callable:
     """
     Use this decorator to create an updater that responds to flows of nodes
@@ -1,8 +1,74 @@
 # Imports
 from collections import defaultdict, Counter
-import networkx as nx
+from collections.abc import Mapping
 import math
-from typing import List
+import numpy
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class LocalitySplitScores(Mapping):
+    """
+    Read-only mapping of score names to score values returned by
+    :class:`LocalitySplits`. Each score is only computed the first time
+    it is looked up, so chain steps that read a single score do not pay
+    for the others.
+
+    :ivar splitter: The :class:`LocalitySplits` updater that produced
+        these scores.
+    :type splitter: LocalitySplits
+    :ivar partition: The partition being scored.
+    :type partition: :class:`~gerrychain.Partition`
+    """
+
+    __slots__ = ["splitter", "partition", "_splits", "_splits_inv", "_keys", "_values"]
+
+    def __init__(self, splitter: "LocalitySplits", partition, keys: List[str]) -> None:
+        """
+        :param splitter: The updater whose score methods are used.
+        :type splitter: LocalitySplits
+        :param partition: The partition being scored.
+        :type partition: :class:`~gerrychain.Partition`
+        :param keys: The names of the scores to expose.
+        :type keys: List[str]
+
+        :returns: None
+        """
+        self.splitter = splitter
+        self.partition = partition
+        # Snapshot the splits so that later calls to the updater on other
+        # partitions do not change the values computed here.
+        self._splits = splitter.locality_splits
+        self._splits_inv = splitter.locality_splits_inv
+        self._keys = list(keys)
+        self._values: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._values:
+            return self._values[key]
+        if key not in self._keys:
+            raise KeyError(key)
+
+        value = None
+        if key in LocalitySplits.score_functions:
+            splitter = self.splitter
+            if key in splitter.split_score_functions:
+                # Scores that only depend on the splits are computed from
+                # the snapshot, leaving the updater's own splits untouched.
+                value = getattr(splitter, "_" + key)(self._splits, self._splits_inv)
+            else:
+                value = getattr(splitter, key)(self.partition)
+
+        self._values[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return "<LocalitySplitScores [{}]>".format(", ".join(self._keys))
 
 
 class LocalitySplits:
@@ -60,7 +126,8 @@ class LocalitySplits:
         the nodes in the graph.
     :type localities: List[str]
     :ivar localitydict: A dictionary mapping node IDs to locality IDs.
-        This is used to quickly look up the locality of a given node.
+        This is built on demand from the internal locality index array,
+        which is what the score functions use to look up localities.
     :type localitydict: Dict[str, str]
     :ivar locality_splits: A dictionary mapping district IDs to a counter
         of localities in that district. That is to say, this tells us
@@ -72,13 +139,30 @@ class LocalitySplits:
         minimum number of districts that locality must touch. This is
         computed using the ideal district population. NOT CURRENTLY USED.
     :type allowed_pieces: Dict[str, int]
-    :ivar scores: A dictionary initialized with the key values from the
-        initializer's scores_to_compute parameter. The initial values are
-        set to none and are updated in each call to store the compted
-        score value for each metric of interest.
-    :type scores: Dict[str, Any]
+    :ivar scores: A mapping keyed by the initializer's scores_to_compute
+        parameter. The initial values are set to none; each call replaces
+        it with a :class:`LocalitySplitScores` which computes the value of
+        each metric of interest the first time it is read.
+    :type scores: Mapping[str, Any]
     """
 
+    score_functions = (
+        "num_parts",
+        "num_pieces",
+        "naked_boundary",
+        "shannon_entropy",
+        "power_entropy",
+        "symmetric_entropy",
+        "num_split_localities",
+    )
+    # The scores computed from locality_splits and locality_splits_inv alone
+    split_score_functions = (
+        "num_parts",
+        "shannon_entropy",
+        "power_entropy",
+        "num_split_localities",
+    )
+
     def __init__(
         self,
         name: str,
@@ -116,7 +200,11 @@ class LocalitySplits:
         self.pent_alpha = pent_alpha
 
         self.localities = []
-        self.localitydict = {}
+        self._locality_names = []
+        self._node_to_idx = {}
+        self._loc_id = numpy.empty(0, dtype=numpy.int32)
+        self._adj = {}
+        self._key = None
         self.locality_splits = {}
         self.locality_splits_inv = {}
 
@@ -130,24 +218,36 @@ class LocalitySplits:
         # certain use cases.
         self.allowed_pieces = {}
 
-        self.scores = dict.fromkeys(scores_to_compute)
+        self.scores_to_compute = list(scores_to_compute)
+        self.scores = dict.fromkeys(self.scores_to_compute)
 
     def __call__(self, partition):
 
         if self.localities == []:
-            self.localitydict = dict(partition.graph.nodes(data=self.col_id))
-            self.localities = set(list(self.localitydict.values()))
-
-        locality_splits = {
-            k: [self.localitydict[v] for v in d]
-            for k, d in partition.assignment.parts.items()
-        }
-        self.locality_splits = {k: Counter(v) for k, v in locality_splits.items()}
+            self._build_index(partition.graph)
+            self._adj = {
+                n: tuple(partition.graph.neighbors(n)) for n in partition.graph.nodes
+            }
 
+        # Build the per-district counters and their inverse in one pass
+        self.locality_splits = {}
         self.locality_splits_inv = defaultdict(dict)
-        for k, v in self.locality_splits.items():
-            for k2, v2 in v.items():
-                self.locality_splits_inv[k2][k] = v2
+        for k, part_nodes in partition.assignment.parts.items():
+            idx = numpy.fromiter(
+                (self._node_to_idx[v] for v in part_nodes),
+                dtype=numpy.intp,
+                count=len(part_nodes),
+            )
+            loc_ids, loc_counts = numpy.unique(self._loc_id[idx], return_counts=True)
+            counts = Counter(
+                {
+                    self._locality_names[i]: int(c)
+                    for i, c in zip(loc_ids.tolist(), loc_counts.tolist())
+                }
+            )
+            self.locality_splits[k] = counts
+            for locality, count in counts.items():
+                self.locality_splits_inv[locality][k] = count
 
         if self.allowed_pieces == {}:
 
@@ -173,29 +273,40 @@ class LocalitySplits:
                 allowed_pieces[loc] = math.ceil(pop / (totpop / num_districts))
             self.allowed_pieces = allowed_pieces
 
-        for s in self.scores:
-            if s == "num_parts":
-                self.scores[s] = self.num_parts(partition)
-
-            if s == "num_pieces":
-                self.scores[s] = self.num_pieces(partition)
-
-            if s == "naked_boundary":
-                self.scores[s] = self.naked_boundary(partition)
-
-            if s == "shannon_entropy":
-                self.scores[s] = self.shannon_entropy(partition)
-
-            if s == "power_entropy":
-                self.scores[s] = self.power_entropy(partition)
+        self.scores = LocalitySplitScores(self, partition, self.scores_to_compute)
+        return self.scores
 
-            if s == "symmetric_entropy":
-                self.scores[s] = self.symmetric_entropy(partition)
+    def _build_index(self, graph) -> None:
+        """
+        Builds the locality index for the nodes of the graph. Each locality
+        is given an integer code and the code of every node is stored in a
+        contiguous array, indexed by the position of the node in the graph.
 
-            if s == "num_split_localities":
-                self.scores[s] = self.num_split_localities(partition)
+        :param graph: The underlying graph of the partition.
+        :type graph: :class:`~gerrychain.Graph`
 
-        return self.scores
+        :returns: None
+        """
+        codes = {}
+        self._node_to_idx = {}
+        loc_id = []
+        for i, (n, locality) in enumerate(graph.nodes(data=self.col_id)):
+            self._node_to_idx[n] = i
+            loc_id.append(codes.setdefault(locality, len(codes)))
+
+        self._locality_names = list(codes)
+        self._loc_id = numpy.array(loc_id, dtype=numpy.int32)
+        self.localities = set(self._locality_names)
+
+    @property
+    def localitydict(self) -> Dict:
+        """
+        :returns: A dictionary mapping node IDs to locality IDs.
+        :rtype: Dict
+        """
+        names = self._locality_names
+        loc_ids = self._loc_id.tolist()
+        return {n: names[loc_ids[i]] for n, i in self._node_to_idx.items()}
 
     def num_parts(self, partition) -> int:
         """
@@ -209,9 +320,12 @@ class LocalitySplits:
         :rtype: int
         """
 
+        return self._num_parts(self.locality_splits, self.locality_splits_inv)
+
+    def _num_parts(self, locality_splits: Dict, locality_splits_inv: Dict) -> int:
         counter = 0
-        for district in self.locality_splits.keys():
-            counter += len(self.locality_splits[district])
+        for district in locality_splits.keys():
+            counter += len(locality_splits[district])
         return counter
 
     def num_pieces(self, partition) -> int:
@@ -225,29 +339,27 @@ class LocalitySplits:
             cutting the graph by both locality and district boundaries.
         :rtype: int
         """
-        locality_intersections = {}
-
-        for n in partition.graph.nodes():
-            locality = partition.graph.nodes[n][self.col_id]
-            if locality not in locality_intersections:
-                locality_intersections[locality] = set(
-                    [partition.assignment.mapping[n]]
-                )
-
-            locality_intersections[locality].update([partition.assignment.mapping[n]])
-
+        # Group the nodes by (locality, district) cell in a single pass.
+        cells = defaultdict(list)
+        mapping = partition.assignment.mapping
+        loc_ids = self._loc_id.tolist()
+        for n, i in self._node_to_idx.items():
+            cells[(loc_ids[i], mapping[n])].append(n)
+
+        # Count the connected components of each cell with a plain DFS over
+        # the cached adjacency lists rather than building a subgraph view.
         pieces = 0
-        for locality in locality_intersections:
-            for d in locality_intersections[locality]:
-                subgraph = partition.graph.subgraph(
-                    [
-                        x
-                        for x in partition.parts[d]
-                        if partition.graph.nodes[x][self.col_id] == locality
-                    ]
-                )
-
-                pieces += nx.number_connected_components(subgraph)
+        for cell_nodes in cells.values():
+            unvisited = set(cell_nodes)
+            while unvisited:
+                stack = [unvisited.pop()]
+                while stack:
+                    u = stack.pop()
+                    for v in self._adj[u]:
+                        if v in unvisited:
+                            unvisited.discard(v)
+                            stack.append(v)
+                pieces += 1
         return pieces
 
     def naked_boundary(self, partition) -> int:
@@ -262,17 +374,63 @@ class LocalitySplits:
         :rtype: int
         """
 
+        previous = self._parent_naked_boundary(partition)
+        node_to_idx = self._node_to_idx
+        loc_id = self._loc_id
+
+        if previous is not None:
+            # Only edges incident to flipped nodes can change whether they
+            # are cut, so update the parent's count from those edges alone.
+            old_mapping = partition.parent.assignment.mapping
+            new_mapping = partition.assignment.mapping
+            cut_edges_within = previous
+            seen = set()
+            for n in partition.flips:
+                seen.add(n)
+                for m in self._adj[n]:
+                    if m in seen or loc_id[node_to_idx[n]] != loc_id[node_to_idx[m]]:
+                        continue
+                    was_cut = old_mapping[n] != old_mapping[m]
+                    is_cut = new_mapping[n] != new_mapping[m]
+                    cut_edges_within += int(is_cut) - int(was_cut)
+            return cut_edges_within
+
         cut_edges_within = 0
         cut_edge_set = partition["cut_edges"]
-        for i in cut_edge_set:
-            vtd_1 = i[0]
-            vtd_2 = i[1]
-            county_1 = self.localitydict.get(vtd_1)
-            county_2 = self.localitydict.get(vtd_2)
+        for vtd_1, vtd_2 in cut_edge_set:
+            county_1 = loc_id[node_to_idx[vtd_1]]
+            county_2 = loc_id[node_to_idx[vtd_2]]
             if county_1 == county_2:  # not on county boundary
                 cut_edges_within += 1
         return cut_edges_within
 
+    def _parent_naked_boundary(self, partition) -> Optional[int]:
+        """
+        :param partition: The partition to be scored.
+        :type partition: :class:`~gerrychain.Partition`
+
+        :returns: The naked boundary score of the parent partition, if it
+            has already been computed, and None otherwise. The parent is
+            never scored here, which would recompute its splits and replace
+            this updater's attributes with the parent's.
+        :rtype: Optional[int]
+        """
+        parent = partition.parent
+        if parent is None or not partition.flips:
+            return None
+
+        if self._key is None:
+            self._key = next(
+                (k for k, u in partition.updaters.items() if u is self), None
+            )
+            if self._key is None:
+                return None
+
+        parent_scores = parent._cache.get(self._key)
+        if not isinstance(parent_scores, LocalitySplitScores):
+            return None
+        return parent_scores._values.get("naked_boundary")
+
     def shannon_entropy(self, partition) -> float:
         """
         Computes the shannon entropy score of a district plan.
@@ -283,35 +441,25 @@ class LocalitySplits:
         :returns: Shannon entropy score.
         :rtype: float
         """
+        return self._shannon_entropy(self.locality_splits, self.locality_splits_inv)
 
+    def _shannon_entropy(self, locality_splits: Dict, locality_splits_inv: Dict) -> float:
         total_vtds = 0
-        for k, v in self.locality_splits.items():
-            for x in list(v.values()):
-                total_vtds += x
+        for v in locality_splits.values():
+            total_vtds += sum(v.values())
 
         entropy = 0
-        for locality_j in self.localities:  # iter thru locs to get total count
-            tot_county_vtds = 0
-            # iter thru counters
-            for k, v in self.locality_splits.items():
-                v = dict(v)
-                if locality_j in list(v.keys()):
-                    tot_county_vtds += v[locality_j]
-
-            inner_sum = 0
+        # iter thru the districts present in each locality
+        for districts in locality_splits_inv.values():
+            tot_county_vtds = sum(districts.values())
             q = tot_county_vtds / total_vtds
 
-            # iter thru districts to get vtds in county in district
-            # for district in range(num_districts):
-            for k, v in self.locality_splits.items():
-                # counter = dict(locality_splits[district+1])
-                count = dict(v)
-                if locality_j in count:
-                    intersection = count[str(locality_j)]
-                    p = intersection / tot_county_vtds
+            inner_sum = 0
+            for intersection in districts.values():
+                p = intersection / tot_county_vtds
 
-                    if p != 0:
-                        inner_sum += p * math.log(1 / p)
+                if p != 0:
+                    inner_sum += p * math.log(1 / p)
 
             entropy += q * (inner_sum)
         return entropy
@@ -326,35 +474,25 @@ class LocalitySplits:
         :returns: Power entropy score.
         :rtype: float
         """
+        return self._power_entropy(self.locality_splits, self.locality_splits_inv)
 
+    def _power_entropy(self, locality_splits: Dict, locality_splits_inv: Dict) -> float:
         total_vtds = 0  # count the total number of vtds in state
-        for k, v in self.locality_splits.items():
-            for x in list(v.values()):
-                total_vtds += x
+        for v in locality_splits.values():
+            total_vtds += sum(v.values())
 
         entropy = 0
-        for locality_j in self.localities:  # iter thru locs to get total count
-            tot_county_vtds = 0
-            # iter thru counters
-            for k, v in self.locality_splits.items():
-                v = dict(v)
-                if locality_j in list(v.keys()):
-                    tot_county_vtds += v[locality_j]
+        # iter thru the districts present in each locality
+        for districts in locality_splits_inv.values():
+            tot_county_vtds = sum(districts.values())
+            q = tot_county_vtds / total_vtds
 
             inner_sum = 0
+            for intersection in districts.values():
+                p = intersection / tot_county_vtds
 
-            q = tot_county_vtds / total_vtds
-            # iter thru districts to get vtds in county in district
-            # for district in range(num_districts):
-            for k, v in self.locality_splits.items():
-                # counter = dict(locality_splits[district+1])
-                count = dict(v)
-                if locality_j in count:
-                    intersection = count[str(locality_j)]
-                    p = intersection / tot_county_vtds
-
-                    if p != 0:
-                        inner_sum += p ** (1 - self.pent_alpha)
+                if p != 0:
+                    inner_sum += p ** (1 - self.pent_alpha)
 
             entropy += 1 / q * (inner_sum - 1)
         return entropy
@@ -380,9 +518,8 @@ class LocalitySplits:
             vtds = district_dict[district]
             locality_pop = {k: 0 for k in self.localities}
             for vtd in vtds:
-                locality_pop[self.localitydict[vtd]] += partition.graph.nodes[vtd][
-                    self.pop_col
-                ]
+                locality = self._locality_names[self._loc_id[self._node_to_idx[vtd]]]
+                locality_pop[locality] += partition.graph.nodes[vtd][self.pop_col]
             district_dict[district] = locality_pop
 
         district_dict_inv = defaultdict(dict)
@@ -423,9 +560,16 @@ class LocalitySplits:
         :rtype: int
         """
 
+        return self._num_split_localities(
+            self.locality_splits, self.locality_splits_inv
+        )
+
+    def _num_split_localities(
+        self, locality_splits: Dict, locality_splits_inv: Dict
+    ) -> int:
         total_splits = 0
 
-        for v in self.locality_splits_inv.values():
+        for v in locality_splits_inv.values():
             if len(v) > 1:
                 total_splits += 1
 
@@ -2,16 +2,186 @@
 Updaters that compute spanning tree statistics.
 """
 
+import functools
 import math
+import random
+from concurrent.futures import Executor, ProcessPoolExecutor
 import numpy
-import networkx
-from typing import Dict
+import scipy.linalg
+import scipy.sparse
+import scipy.sparse.csgraph
+import scipy.sparse.linalg
+from typing import Dict, List, Optional
 
 
-def _num_spanning_trees_in_district(partition, district: int) -> int:
+def _district_laplacian(partition, district: int) -> scipy.sparse.csr_array:
     """
-    Given a district ID, returns the number of spanning trees in the
-    subgraph of self corresponding to the district.
+    Assembles the Laplacian of a district directly from the edges of its
+    :class:`~gerrychain.partition.subgraphs.PartAdjacencyView`, as the sum of
+    the (negated) adjacency and degree matrices in one sparse constructor.
+    Edge ``"weight"`` attributes are used when the graph has them, as in
+    :func:`networkx.laplacian_matrix`.
+
+    :param partition: :class:`gerrychain.Partition`
+    :type partition: :class:`gerrychain.Partition`
+    :param district: A district label (part) in the partition.
+    :type district: int
+
+    :returns: The Laplacian matrix of the subgraph induced by the district.
+    :rtype: scipy.sparse.csr_array
+    """
+    view = partition.subgraphs.adjacency_view(district)
+    n = len(view)
+    weights = partition.graph.adjacency_weights("weight")
+    if weights is None:
+        rows, cols = view.local_edges()
+        values = numpy.ones(len(rows))
+    else:
+        rows, cols, values = view.local_edges(weights)
+    degrees = numpy.bincount(rows, weights=values, minlength=n)
+    diagonal = numpy.arange(n)
+    return scipy.sparse.csr_array(
+        (
+            numpy.concatenate([-values, degrees]),
+            (numpy.concatenate([rows, diagonal]), numpy.concatenate([cols, diagonal])),
+        ),
+        shape=(n, n),
+    )
+
+
+def _reduced_laplacian_slogdet(laplacian: scipy.sparse.csr_array) -> float:
+    """
+    The reduced Laplacian is sparse and positive definite for a connected
+    graph, so its log-determinant is read off the diagonal of a sparse LU
+    factorization rather than a dense one.
+
+    The graph must be connected: for a disconnected graph the factorization
+    usually leaves a tiny pivot rather than failing, which would give a
+    meaningless value. :func:`_reduced_laplacian_logdet` checks this first.
+
+    :param laplacian: The Laplacian matrix of a connected graph.
+    :type laplacian: scipy.sparse.csr_array
+
+    :returns: The log-determinant of the Laplacian with its first row and
+        column removed.
+    :rtype: float
+    """
+    reduced = scipy.sparse.csc_matrix(laplacian[1:, 1:])
+    if reduced.shape[0] == 0:
+        return 0.0
+    try:
+        lu = scipy.sparse.linalg.splu(reduced)
+    except RuntimeError:
+        return -math.inf
+    return float(numpy.log(numpy.abs(lu.U.diagonal())).sum())
+
+
+def _slq_logdet(
+    matrix: scipy.sparse.csc_matrix, probes: int, lanczos_steps: int, seed: int
+) -> float:
+    """
+    Estimates the log-determinant of a symmetric positive definite matrix with
+    stochastic Lanczos quadrature: ``log det(A) = tr(log(A))`` is estimated by
+    averaging ``z^T log(A) z`` over random Rademacher vectors ``z``, where each
+    quadratic form is computed by Gauss quadrature on the Lanczos
+    tridiagonalization of ``A`` started from ``z``. Only sparse matrix-vector
+    products are needed.
+
+    :param matrix: A symmetric positive definite sparse matrix.
+    :type matrix: scipy.sparse.csc_matrix
+    :param probes: The number of random probe vectors.
+    :type probes: int
+    :param lanczos_steps: The number of Lanczos iterations per probe.
+    :type lanczos_steps: int
+    :param seed: Seed for the probe vectors.
+    :type seed: int
+
+    :returns: An estimate of the log-determinant of the matrix.
+    :rtype: float
+    """
+    n = matrix.shape[0]
+    rng = numpy.random.default_rng(seed)
+    estimate = 0.0
+    for _ in range(probes):
+        v = rng.choice([-1.0, 1.0], size=n) / math.sqrt(n)
+        v_prev = numpy.zeros(n)
+        alphas: List[float] = []
+        betas: List[float] = []
+        beta = 0.0
+        for _ in range(min(lanczos_steps, n)):
+            w = matrix @ v - beta * v_prev
+            alpha = float(w @ v)
+            w -= alpha * v
+            alphas.append(alpha)
+            beta = float(numpy.linalg.norm(w))
+            if beta < 1e-10:
+                break
+            betas.append(beta)
+            v_prev, v = v, w / beta
+
+        k = len(alphas)
+        eigenvalues, eigenvectors = scipy.linalg.eigh_tridiagonal(
+            numpy.array(alphas), numpy.array(betas[: k - 1])
+        )
+        estimate += n * float(eigenvectors[0] ** 2 @ numpy.log(eigenvalues))
+    return estimate / probes
+
+
+def _check_method(method: str) -> None:
+    """
+    :param method: The method option of :func:`log_num_spanning_trees`.
+    :type method: str
+
+    :raises ValueError: If ``method`` is neither ``"exact"`` nor ``"slq"``.
+    """
+    if method not in ("exact", "slq"):
+        raise ValueError("Unknown method {!r}; use 'exact' or 'slq'.".format(method))
+
+
+def _reduced_laplacian_logdet(
+    laplacian: scipy.sparse.csr_array,
+    seed: Optional[int] = None,
+    method: str = "exact",
+    probes: int = 20,
+    lanczos_steps: int = 30,
+    exact_below: int = 1024,
+) -> float:
+    """
+    :param laplacian: The Laplacian matrix of a graph.
+    :type laplacian: scipy.sparse.csr_array
+    :param seed: Seed for the probe vectors of the ``"slq"`` method.
+    :type seed: Optional[int], optional
+    :param method: Either ``"exact"`` or ``"slq"``. See
+        :func:`log_num_spanning_trees`.
+    :type method: str, optional
+    :param probes: The number of probe vectors of the ``"slq"`` method.
+    :type probes: int, optional
+    :param lanczos_steps: The number of Lanczos steps of the ``"slq"`` method.
+    :type lanczos_steps: int, optional
+    :param exact_below: Graphs with fewer nodes than this are always
+        computed exactly.
+    :type exact_below: int, optional
+
+    :returns: The (possibly estimated) log-determinant of the reduced Laplacian,
+        or ``-inf`` if the graph is disconnected (it has no spanning trees).
+    :rtype: float
+    """
+    _check_method(method)
+    components = scipy.sparse.csgraph.connected_components(
+        laplacian, directed=False, return_labels=False
+    )
+    if components > 1:
+        return -math.inf
+    if method == "exact" or laplacian.shape[0] < exact_below:
+        return _reduced_laplacian_slogdet(laplacian)
+    reduced = scipy.sparse.csc_matrix(laplacian[1:, 1:])
+    return _slq_logdet(reduced, probes, lanczos_steps, seed)
+
+
+def _log_num_spanning_trees_in_district(partition, district: int, **kwargs) -> float:
+    """
+    Given a district ID, returns the natural logarithm of the number of
+    spanning trees in the subgraph of self corresponding to the district.
 
     Uses Kirchoff's theorem to compute the number of spanning trees.
 
@@ -19,23 +189,245 @@ def _num_spanning_trees_in_district(partition, district: int) -> int:
     :type partition: :class:`gerrychain.Partition`
     :param district: A district label (part) in the partition.
     :type district: int
+    :param `**kwargs`: Passed on to :func:`_reduced_laplacian_logdet`.
 
-    :returns: The number of spanning trees in the subgraph of the
+    :returns: The log of the number of spanning trees in the subgraph of the
         partition corresponding to district
-    :rtype: int
+    :rtype: float
+    """
+    laplacian = _district_laplacian(partition, district)
+    return _reduced_laplacian_logdet(laplacian, **kwargs)
+
+
+def _exp(log_value: float) -> float:
+    """
+    :returns: ``math.exp(log_value)``, or infinity when that overflows.
+    :rtype: float
+    """
+    try:
+        return math.exp(log_value)
+    except OverflowError:
+        return math.inf
+
+
+def log_num_spanning_trees(
+    partition,
+    executor: Optional[Executor] = None,
+    method: str = "exact",
+    probes: int = 20,
+    lanczos_steps: int = 30,
+) -> Dict[int, float]:
     """
-    graph = partition.subgraphs[district]
-    laplacian = networkx.laplacian_matrix(graph)
-    L = numpy.delete(numpy.delete(laplacian.todense(), 0, 0), 1, 1)
-    return math.exp(numpy.linalg.slogdet(L)[1])
+    The number of spanning trees of a district grows exponentially with its
+    size and overflows a float for large districts, so this is the preferred
+    way to compare spanning tree counts.
 
+    The determinant for each district is independent of the others, so they
+    can be computed in parallel by passing an ``executor``, such as a
+    :class:`~concurrent.futures.ProcessPoolExecutor`. Only the district
+    Laplacians are sent to the workers. Starting a process pool costs far
+    more than the determinants of typical districts, so create the executor
+    once and reuse it for the whole chain (or use :class:`NumSpanningTrees`
+    with ``max_workers``, which keeps its own pool).
 
-def num_spanning_trees(partition) -> Dict[int, int]:
+    For very large districts, ``method="slq"`` replaces the exact
+    factorization with a stochastic Lanczos quadrature estimate that only
+    needs sparse matrix-vector products. Its error shrinks as ``probes`` and
+    ``lanczos_steps`` grow. Districts with fewer than 1024 nodes are always
+    computed exactly. The probe vectors are seeded from Python's
+    :mod:`random` module, so seeded chains stay reproducible.
+
+    :param partition: :class:`gerrychain.Partition`
+    :type partition: :class:`gerrychain.Partition`
+    :param executor: A long-lived executor used to compute the determinants.
+        Default is None, which computes them in this process.
+    :type executor: Optional[concurrent.futures.Executor], optional
+    :param method: Either ``"exact"`` or ``"slq"``. Default is ``"exact"``.
+    :type method: str, optional
+    :param probes: The number of random probe vectors used by the ``"slq"``
+        method. Default is 20.
+    :type probes: int, optional
+    :param lanczos_steps: The number of Lanczos iterations per probe used by
+        the ``"slq"`` method. Default is 30.
+    :type lanczos_steps: int, optional
+
+    :returns: The natural logarithm of the number of spanning trees in each
+        part (district) of a partition.
+    :rtype: Dict[int, float]
+
+    :raises ValueError: If ``method`` is neither ``"exact"`` nor ``"slq"``.
     """
+    _check_method(method)
+    options = dict(method=method, probes=probes, lanczos_steps=lanczos_steps)
+    return _log_num_spanning_trees_in_parts(
+        partition, list(partition.parts), executor, options
+    )
+
+
+def _log_num_spanning_trees_in_parts(
+    partition, parts: List, executor: Optional[Executor], options: Dict
+) -> Dict[int, float]:
+    """
+    :param partition: :class:`gerrychain.Partition`
+    :type partition: :class:`gerrychain.Partition`
+    :param parts: The districts to compute.
+    :type parts: List
+    :param executor: See :func:`log_num_spanning_trees`.
+    :type executor: Optional[concurrent.futures.Executor]
+    :param options: The ``method``, ``probes`` and ``lanczos_steps`` options of
+        :func:`log_num_spanning_trees`.
+    :type options: Dict
+
+    :returns: The log of the number of spanning trees of each given district.
+    :rtype: Dict[int, float]
+    """
+    slq = options.get("method") == "slq"
+    seeds = [random.getrandbits(32) if slq else None for _ in parts]
+
+    if executor is None or len(parts) <= 1:
+        return {
+            part: _log_num_spanning_trees_in_district(partition, part, seed=seed, **options)
+            for part, seed in zip(parts, seeds)
+        }
+
+    laplacians = [_district_laplacian(partition, part) for part in parts]
+    logdet = functools.partial(_reduced_laplacian_logdet, **options)
+    return dict(zip(parts, executor.map(logdet, laplacians, seeds)))
+
+
+def num_spanning_trees(
+    partition, executor: Optional[Executor] = None, **kwargs
+) -> Dict[int, float]:
+    """
+    Districts whose number of spanning trees does not fit in a float are
+    reported as infinity; use :func:`log_num_spanning_trees` to compare them.
+
+    :param partition: :class:`gerrychain.Partition`
+    :type partition: :class:`gerrychain.Partition`
+    :param executor: A long-lived executor used to compute the determinants.
+        See :func:`log_num_spanning_trees`. Default is None.
+    :type executor: Optional[concurrent.futures.Executor], optional
+    :param `**kwargs`: The ``method``, ``probes`` and ``lanczos_steps`` options
+        of :func:`log_num_spanning_trees`.
+
     :returns: The number of spanning trees in each part (district) of a partition.
-    :rtype: Dict[int, int]
+    :rtype: Dict[int, float]
+
+    :raises ValueError: If ``method`` is neither ``"exact"`` nor ``"slq"``.
     """
+    _check_method(kwargs.get("method", "exact"))
     return {
-        part: _num_spanning_trees_in_district(partition, part)
-        for part in partition.parts
+        part: _exp(log_value)
+        for part, log_value in log_num_spanning_trees(
+            partition, executor, **kwargs
+        ).items()
     }
+
+
+class NumSpanningTrees:
+    """
+    An updater for the number of spanning trees in each part of a partition
+    that remembers the value computed for each part. Parts whose nodes are
+    unchanged since the last call (e.g. every district not touched by a ReCom
+    step) reuse their previous value instead of a new factorization.
+
+    Example usage::
+
+        partition = Partition(
+            graph,
+            assignment,
+            updaters={"log_spanning_trees": NumSpanningTrees(log=True)}
+        )
+
+    With ``max_workers``, the updater starts a process pool the first time it
+    is needed and keeps it for every later step. Call :meth:`shutdown` to
+    stop it once the chain is done.
+
+    :ivar log: Whether to return the natural logarithm of the counts, as
+        :func:`log_num_spanning_trees` does, rather than the counts.
+    :type log: bool
+    :ivar max_workers: The number of worker processes used to compute the
+        determinants, or None to compute them in this process.
+    :type max_workers: Optional[int]
+    :ivar options: The ``method``, ``probes`` and ``lanczos_steps`` options
+        of :func:`log_num_spanning_trees`.
+    :type options: Dict
+    """
+
+    __slots__ = ["log", "max_workers", "options", "_graph", "_cache", "_executor"]
+
+    def __init__(
+        self, log: bool = False, max_workers: Optional[int] = None, **options
+    ) -> None:
+        """
+        :param log: Whether to return the natural logarithm of the counts.
+            Default is False.
+        :type log: bool, optional
+        :param max_workers: The number of worker processes used to compute the
+            determinants. Default is None, which computes them in this process.
+        :type max_workers: Optional[int], optional
+        :param `**options`: The ``method``, ``probes`` and ``lanczos_steps``
+            options of :func:`log_num_spanning_trees`.
+
+        :returns: None
+
+        :raises ValueError: If ``method`` is neither ``"exact"`` nor ``"slq"``.
+        """
+        _check_method(options.get("method", "exact"))
+        self.log = log
+        self.max_workers = max_workers
+        self.options = options
+        self._graph = None
+        self._cache = {}
+        self._executor = None
+
+    def __getstate__(self) -> Dict:
+        # Neither the process pool nor the per-graph cache is carried over;
+        # a copy starts its own.
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state.update(_graph=None, _cache={}, _executor=None)
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def shutdown(self) -> None:
+        """
+        Stops the worker processes, if any were started. They are started
+        again if the updater is called afterwards.
+
+        :returns: None
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __call__(self, partition) -> Dict[int, float]:
+        if partition.graph is not self._graph:
+            self._graph = partition.graph
+            self._cache = {}
+
+        parts = partition.parts
+        # The node sets of parts are immutable frozensets that are only
+        # replaced when the part changes, so identity is enough here.
+        stale = [
+            part
+            for part, nodes in parts.items()
+            if self._cache.get(part, (None,))[0] is not nodes
+        ]
+        if stale:
+            executor = None
+            if self.max_workers is not None and self.max_workers > 1 and len(stale) > 1:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                executor = self._executor
+            computed = _log_num_spanning_trees_in_parts(
+                partition, stale, executor, self.options
+            )
+            for part, log_value in computed.items():
+                self._cache[part] = (parts[part], log_value)
+
+        if self.log:
+            return {part: self._cache[part][1] for part in parts}
+        return {part: _exp(self._cache[part][1]) for part in parts}
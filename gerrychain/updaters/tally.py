@@ -2,10 +2,15 @@ import collections
 import math
 import warnings
 
-from .flows import flows_from_changes, on_flow
+from .flows import flow_positions, on_flow
 from typing import Dict, Union, List, Optional, Type
+import numpy
 import pandas
 
+# Flows of fewer nodes than this (e.g. single flips) are cheaper to sum in
+# Python than to gather from the node arrays.
+_SMALL_FLOW = 8
+
 
 class DataTally:
     """
@@ -19,7 +24,7 @@ class DataTally:
     :type alias: str
     """
 
-    __slots__ = ["data", "alias", "_call"]
+    __slots__ = ["data", "alias", "_call", "_graph", "_data_arr"]
 
     def __init__(self, data: Union[Dict, pandas.Series, str], alias: str) -> None:
         """
@@ -33,6 +38,8 @@ class DataTally:
         """
         self.data = data
         self.alias = alias
+        self._graph = None
+        self._data_arr = None
 
         def initialize_tally(partition):
             if isinstance(self.data, str):
@@ -40,28 +47,87 @@ class DataTally:
                 attribute = self.data
                 self.data = {node: nodes[node][attribute] for node in nodes}
 
-            tally = collections.defaultdict(int)
-            for node, part in partition.assignment.items():
-                add = self.data[node]
+            data_arr = self._data_column(partition.graph)
+            if data_arr is None:
+                return self._initialize_tally_by_node(partition)
 
-                if math.isnan(add):
-                    warnings.warn(
-                        "ignoring nan encountered at node '{}' for attribute '{}'".format(
-                            node, self.alias
-                        )
-                    )
-                else:
-                    tally[part] += add
-            return dict(tally)
+            return _tally_by_part(
+                partition,
+                data_arr,
+                0,
+                "attribute '{}'".format(self.alias),
+            )
 
         @on_flow(initialize_tally, alias=alias)
         def update_tally(partition, previous, new_nodes, old_nodes):
-            inflow = sum(self.data[node] for node in new_nodes)
-            outflow = sum(self.data[node] for node in old_nodes)
+            inflow = self._sum(partition, new_nodes)
+            outflow = self._sum(partition, old_nodes)
             return previous + inflow - outflow
 
         self._call = update_tally
 
+    def _data_column(self, graph) -> Optional[numpy.ndarray]:
+        """
+        :param graph: The graph that the partition is defined on.
+        :type graph: :class:`~gerrychain.graph.graph.FrozenGraph`
+
+        :returns: A contiguous copy of the data, ordered like
+            ``graph.node_index()``, for summing whole parts and large flows,
+            or None if the data is not numeric.
+        :rtype: Optional[numpy.ndarray]
+        """
+        if graph is not self._graph:
+            data_arr = numpy.array([self.data[node] for node in graph.node_index()])
+            self._data_arr = data_arr if data_arr.dtype.kind in "biuf" else None
+            self._graph = graph
+        return self._data_arr
+
+    def _initialize_tally_by_node(self, partition) -> Dict:
+        """
+        Compute the initial tally one node at a time. This is used when the
+        data cannot be summed as a numeric array.
+
+        :param partition: The partition to compute the tally for.
+        :type partition: :class:`~gerrychain.partition.Partition`
+
+        :returns: A dictionary keyed by the parts of the partition, with values
+            being the sum of the data of the nodes in that part.
+        :rtype: Dict
+        """
+        tally = collections.defaultdict(int)
+        for node, part in partition.assignment.items():
+            add = self.data[node]
+
+            if math.isnan(add):
+                warnings.warn(
+                    "ignoring nan encountered at node '{}' for attribute '{}'".format(
+                        node, self.alias
+                    )
+                )
+            else:
+                tally[part] += add
+        return dict(tally)
+
+    def _sum(self, partition, nodes) -> Union[int, float]:
+        """
+        :param partition: The partition being updated.
+        :type partition: :class:`~gerrychain.partition.Partition`
+        :param nodes: A collection of nodes of the graph.
+
+        :returns: The sum of the data over the given nodes.
+        :rtype: Union[int, float]
+        """
+        if len(nodes) < _SMALL_FLOW:
+            return sum(self.data[node] for node in nodes)
+        data_arr = self._data_column(partition.graph)
+        if data_arr is None:
+            return sum(self.data[node] for node in nodes)
+        node_index = partition.graph.node_index()
+        idx = numpy.fromiter(
+            (node_index[node] for node in nodes), dtype=numpy.intp, count=len(nodes)
+        )
+        return data_arr[idx].sum().item()
+
     def __call__(self, partition, previous=None):
         return self._call(partition, previous)
 
@@ -78,15 +144,27 @@ class Tally:
     :type alias: Optional[str]
     :ivar dtype: The type (int, float, etc.) that you want the tally to have
     :type dtype: Any
+    :ivar column_dtype: The NumPy type used to store the summed node values,
+        or None to keep the type of the node attributes.
+    :type column_dtype: Optional[numpy.dtype]
     """
 
-    __slots__ = ["fields", "alias", "dtype"]
+    __slots__ = [
+        "fields",
+        "alias",
+        "dtype",
+        "column_dtype",
+        "_graph",
+        "_values",
+        "_by_node",
+    ]
 
     def __init__(
         self,
         fields: Union[str, List[str]],
         alias: Optional[str] = None,
         dtype: Type = int,
+        column_dtype: Optional[numpy.dtype] = None,
     ) -> None:
         """
         :param fields: The list of node attributes that you want to tally. Or a just a
@@ -99,6 +177,12 @@ class Tally:
         :param dtype: The type (int, float, etc.) that you want the tally to have.
             Default is int.
         :type dtype: Any, optional
+        :param column_dtype: A narrower NumPy type (e.g. ``numpy.int32`` or
+            ``numpy.float32``) to store the summed node values in. This halves
+            the memory traffic of summing large flows on big graphs. Sums are
+            still accumulated in 64 bits. Default is None, which keeps the
+            type of the node attributes.
+        :type column_dtype: Optional[numpy.dtype], optional
 
         :returns: None
         """
@@ -109,6 +193,10 @@ class Tally:
         self.fields = fields
         self.alias = alias
         self.dtype = dtype
+        self.column_dtype = column_dtype
+        self._graph = None
+        self._values = None
+        self._by_node = None
 
     def __call__(self, partition):
         if partition.parent is None:
@@ -123,6 +211,30 @@ class Tally:
         :param partition: The partition to compute the tally for.
         :type partition: :class:`~gerrychain.partition.Partition`
 
+        :returns: A dictionary keyed by the parts of the partition, with values
+            being the sum of the "field" attribute of nodes in that part.
+        :rtype: Dict
+        """
+        graph = partition.graph
+        values = self._column(graph)
+        if values is None:
+            return self._initialize_tally_by_node(partition)
+
+        return _tally_by_part(
+            partition,
+            values,
+            self.dtype(),
+            "attribute '{}' with fields {}".format(self.alias, self.fields),
+        )
+
+    def _initialize_tally_by_node(self, partition) -> Dict:
+        """
+        Compute the initial tally one node at a time. This is used when the
+        node attributes cannot be summed as a numeric array.
+
+        :param partition: The partition to compute the tally for.
+        :type partition: :class:`~gerrychain.partition.Partition`
+
         :returns: A dictionary keyed by the parts of the partition, with values
             being the sum of the "field" attribute of nodes in that part.
         :rtype: Dict
@@ -158,18 +270,190 @@ class Tally:
         new_tally = dict(old_tally)
 
         graph = partition.graph
-
-        for part, flow in flows_from_changes(parent, partition).items():
-            out_flow = compute_out_flow(graph, self.fields, flow)
-            in_flow = compute_in_flow(graph, self.fields, flow)
-            new_tally[part] = old_tally[part] - out_flow + in_flow
+        flows = partition.flows
+        values = self._column(graph)
+
+        size = sum(len(flow["in"]) + len(flow["out"]) for flow in flows.values())
+        if values is None or size < _SMALL_FLOW:
+            for part, flow in flows.items():
+                out_flow = self._flow_sum(graph, flow["out"])
+                in_flow = self._flow_sum(graph, flow["in"])
+                new_tally[part] = old_tally[part] - out_flow + in_flow
+            return new_tally
+
+        # Gather the values of every flowing node at once and reduce them by
+        # (part, side) segment. The positions are shared by all the tallies
+        # of this partition.
+        positions, segments, parts = flow_positions(partition)
+        sums = numpy.zeros(2 * len(parts), dtype=_accumulator_dtype(values))
+        numpy.add.at(sums, segments, values[positions])
+        sums = sums.tolist()
+
+        for i, part in enumerate(parts):
+            new_tally[part] = old_tally[part] - sums[2 * i + 1] + sums[2 * i]
 
         return new_tally
 
+    def _column(self, graph) -> Optional[numpy.ndarray]:
+        """
+        :param graph: The graph that the partition is defined on.
+        :type graph: :class:`~gerrychain.graph.graph.FrozenGraph`
+
+        :returns: The sum of the "field" attributes of every node, ordered like
+            ``graph.node_index()``, or None if the attributes are not numeric.
+        :rtype: Optional[numpy.ndarray]
+        """
+        if graph is not self._graph:
+            values = sum(graph.field_array(field) for field in self.fields)
+            if values.dtype.kind in "biuf":
+                if self.column_dtype is not None:
+                    values = _downcast(values, self.column_dtype, self.alias)
+                self._values = values
+                # The fields are folded into one value per node, so small
+                # flows cost one dict lookup per node however many fields
+                # the tally has.
+                self._by_node = dict(zip(graph.node_list(), values.tolist()))
+            else:
+                self._values = self._by_node = None
+            self._graph = graph
+        return self._values
+
+    def _flow_sum(self, graph, nodes) -> Union[int, float]:
+        """
+        :param graph: The graph that the partition is defined on.
+        :type graph: :class:`~gerrychain.graph.graph.FrozenGraph`
+        :param nodes: The nodes in one side ("in" or "out") of a flow.
+
+        :returns: The sum of the "field" attributes of the given nodes.
+        :rtype: Union[int, float]
+        """
+        if self._column(graph) is None:
+            return _sum_fields(graph, self.fields, nodes)
+        by_node = self._by_node
+        return sum(by_node[node] for node in nodes)
+
     def _get_tally_from_node(self, partition, node):
         return sum(partition.graph.lookup(node, field) for field in self.fields)
 
 
+def _tally_by_part(partition, values: numpy.ndarray, zero, description: str) -> Dict:
+    """
+    Sums a column of node values over each part of a partition, skipping
+    (and warning about) NaN values.
+
+    :param partition: The partition to compute the tally for.
+    :type partition: :class:`~gerrychain.partition.Partition`
+    :param values: The value of every node, ordered like
+        ``partition.graph.node_index()``.
+    :type values: numpy.ndarray
+    :param zero: The value that each part's sum starts from; this sets the
+        type of the tally.
+    :param description: Describes the tallied data in the warning issued
+        when NaN values are found.
+    :type description: str
+
+    :returns: A dictionary keyed by the parts of the partition with at least
+        one non-NaN value, with values being the sum of the values in that part.
+    :rtype: Dict
+    """
+    part_of_node = partition.assignment_array
+
+    if values.dtype.kind == "f":
+        mask = ~numpy.isnan(values)
+        if not mask.all():
+            nodes = partition.graph.node_list()
+            bad = [nodes[i] for i in numpy.flatnonzero(~mask)[:5].tolist()]
+            warnings.warn(
+                "ignoring {} nan value(s) encountered at nodes {}{} for {}".format(
+                    len(mask) - int(mask.sum()),
+                    ", ".join("'{}'".format(node) for node in bad),
+                    ", ..." if len(mask) - int(mask.sum()) > len(bad) else "",
+                    description,
+                )
+            )
+            values = values[mask]
+            part_of_node = part_of_node[mask]
+    elif values.dtype.kind == "b":
+        values = values.astype(int)
+
+    sums = numpy.zeros(len(partition.parts), dtype=_accumulator_dtype(values))
+    numpy.add.at(sums, part_of_node, values)
+    present = numpy.bincount(part_of_node, minlength=len(partition.parts)) > 0
+
+    sums = sums.tolist()
+    return {
+        part: zero + sums[i]
+        for i, part in enumerate(partition.parts)
+        if present[i]
+    }
+
+
+def _accumulator_dtype(values: numpy.ndarray) -> numpy.dtype:
+    """
+    :returns: The 64-bit type used to accumulate sums of the given values.
+    :rtype: numpy.dtype
+    """
+    if values.dtype.kind in "biu":
+        return numpy.promote_types(values.dtype, numpy.int64)
+    return numpy.promote_types(values.dtype, numpy.float64)
+
+
+def _downcast(values: numpy.ndarray, column_dtype, alias: str) -> numpy.ndarray:
+    """
+    :param values: The summed node values of a tally.
+    :type values: numpy.ndarray
+    :param column_dtype: The NumPy type to store the values in.
+    :param alias: The name of the tally, for the error message.
+    :type alias: str
+
+    :returns: The values stored as ``column_dtype``.
+    :rtype: numpy.ndarray
+
+    :raises ValueError: If an integer type cannot hold every value (or the
+        total), or if integer storage is requested for fractional or nan values.
+    """
+    column_dtype = numpy.dtype(column_dtype)
+    if column_dtype.kind in "iu":
+        if values.dtype.kind == "f" and not numpy.array_equal(values, numpy.floor(values)):
+            raise ValueError(
+                "Tally '{}' has fractional or nan values that cannot be stored as {}".format(
+                    alias, column_dtype
+                )
+            )
+        info = numpy.iinfo(column_dtype)
+        total = numpy.abs(values).sum(dtype=numpy.float64)
+        if len(values) and (values.min() < info.min or values.max() > info.max):
+            raise ValueError(
+                "Tally '{}' has values that do not fit in {}".format(alias, column_dtype)
+            )
+        if total >= numpy.iinfo(numpy.int64).max:
+            raise ValueError("Tally '{}' may overflow a 64-bit sum".format(alias))
+    downcast = values.astype(column_dtype)
+    downcast.flags.writeable = False
+    return downcast
+
+
+def _sum_fields(graph, fields: Union[str, List[str]], nodes) -> int:
+    """
+    :param graph: The graph that the partition is defined on.
+    :type graph: :class:`~gerrychain.graph.Graph`
+    :param fields: The list of node attributes that you want to tally. Or just a
+        single attribute name as a string.
+    :type fields: Union[str, List[str]]
+    :param nodes: The nodes to sum over.
+
+    :returns: The sum of the given attributes over the given nodes.
+    :rtype: int
+    """
+    if isinstance(fields, str):
+        fields = [fields]
+    node_data = graph.nodes
+    total = 0
+    for field in fields:
+        total += sum(node_data[node][field] for node in nodes)
+    return total
+
+
 def compute_out_flow(graph, fields: Union[str, List[str]], flow: Dict) -> int:
     """
     :param graph: The graph that the partition is defined on.
@@ -185,7 +469,7 @@ def compute_out_flow(graph, fields: Union[str, List[str]], flow: Dict) -> int:
     :returns: The sum of the "field" attribute of nodes in the "out" set of the flow.
     :rtype: int
     """
-    return sum(graph.lookup(node, field) for node in flow["out"] for field in fields)
+    return _sum_fields(graph, fields, flow["out"])
 
 
 def compute_in_flow(graph, fields: Union[str, List[str]], flow: Dict) -> int:
@@ -203,4 +487,4 @@ def compute_in_flow(graph, fields: Union[str, List[str]], flow: Dict) -> int:
     :returns: The sum of the "field" attribute of nodes in the "in" set of the flow.
     :rtype: int
     """
-    return sum(graph.lookup(node, field) for node in flow["in"] for field in fields)
+    return _sum_fields(graph, fields, flow["in"])
@@ -10,6 +10,7 @@ from gerrychain.constraints import (SelfConfiguringLowerBound, Validator,
                                     no_vanishing_districts,
                                     single_flip_contiguous,
                                     deviation_from_ideal)
+from gerrychain.constraints.contiguity import number_of_contiguous_parts
 from gerrychain.partition import Partition
 from gerrychain.partition.partition import get_assignment
 from gerrychain.graph import Graph
@@ -103,6 +104,25 @@ def test_discontiguous_with_contiguous_bfs_flips_is_false(
     assert not contiguous_bfs(discontiguous_partition2)
 
 
+def test_contiguous_bfs_agrees_with_contiguous_on_random_grid_plans():
+    graph = Graph.from_networkx(nx.grid_graph([6, 6]))
+    rng = numpy.random.default_rng(2024)
+    for _ in range(20):
+        assignment = {node: int(rng.integers(3)) for node in graph.nodes}
+        partition = Partition(graph, assignment)
+        assert contiguous_bfs(partition) == contiguous(partition)
+
+
+def test_number_of_contiguous_parts_counts_connected_parts():
+    graph = Graph.from_networkx(nx.path_graph(6))
+    # Part 0 is split in two, parts 1 and 2 are connected
+    partition = Partition(graph, {0: 0, 1: 1, 2: 0, 3: 2, 4: 2, 5: 2})
+    assert number_of_contiguous_parts(partition) == 2
+    assert number_of_contiguous_parts(partition.flip({1: 0})) == 2
+    assert number_of_contiguous_parts(partition.flip({2: 1})) == 3
+    assert number_of_contiguous_parts(partition.flip({0: 1})) == 3
+
+
 def test_districts_within_tolerance_returns_false_if_districts_are_not_within_tolerance():
     # 100 and 1 are not within 1% of each other, so we should expect False
     mock_partition = {"population": {0: 100.0, 1: 1.0}}
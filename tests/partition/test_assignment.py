@@ -109,3 +109,9 @@ def test_get_assignment_with_series():
 
 def test_repr(assignment):
     assert repr(assignment) == "<Assignment [3 keys, 2 parts]>"
+
+
+def test_from_dict_builds_parts_and_mapping():
+    assignment = Assignment.from_dict({"a": 1, "b": 2, "c": 1})
+    assert assignment.parts == {1: frozenset({"a", "c"}), 2: frozenset({"b"})}
+    assert assignment.mapping == {"a": 1, "b": 2, "c": 1}
@@ -181,3 +181,67 @@ def test_geographic_partition_has_default_updaters(example_geographic_partition)
     assert hasattr(example_geographic_partition, "cut_edges")
     assert hasattr(example_geographic_partition, "area")
     assert hasattr(example_geographic_partition, "cut_edges_by_part")
+
+
+def test_assignment_array_matches_parts(example_partition):
+    parts = list(example_partition.parts)
+    node_index = example_partition.graph.node_index()
+    array = example_partition.assignment_array
+    for node, i in node_index.items():
+        assert parts[array[i]] == example_partition.assignment[node]
+
+
+def test_adjacency_view_matches_subgraph(example_partition):
+    for part in example_partition.parts:
+        view = example_partition.subgraphs.adjacency_view(part)
+        subgraph = example_partition.subgraphs[part]
+        assert set(view) == set(subgraph.nodes)
+        assert len(view) == len(subgraph.nodes)
+        for node in subgraph.nodes:
+            assert node in view
+            assert set(view.neighbors(node)) == set(subgraph.neighbors(node))
+
+
+def test_adjacency_view_local_edges_on_grid():
+    graph = Graph.from_networkx(networkx.grid_graph([5, 4]))
+    assignment = {node: (node[0] + 2 * node[1]) % 3 for node in graph.nodes}
+    partition = Partition(graph, assignment)
+    for part in partition.parts:
+        view = partition.subgraphs.adjacency_view(part)
+        subgraph = partition.subgraphs[part]
+        nodes = list(view)
+        rows, cols = view.local_edges()
+        edges = {(nodes[i], nodes[j]) for i, j in zip(rows.tolist(), cols.tolist())}
+        expected = set(subgraph.edges) | {(v, u) for u, v in subgraph.edges}
+        assert edges == expected
+        for node in graph.nodes:
+            assert (node in view) == (assignment[node] == part)
+        assert "not a node" not in view
+
+
+def test_nodes_array_is_reused_for_unchanged_parts(example_partition):
+    node_index = example_partition.graph.node_index()
+    arrays = {part: example_partition.subgraphs.nodes_array(part) for part in example_partition.parts}
+    for part, nodes in example_partition.parts.items():
+        assert sorted(arrays[part]) == sorted(node_index[node] for node in nodes)
+
+    node, part = next(iter(example_partition.assignment.items()))
+    other = next(p for p in example_partition.parts if p != part)
+    child = example_partition.flip({node: other})
+    for p in child.parts:
+        if p in (part, other):
+            assert node_index[node] in child.subgraphs.nodes_array(other)
+        else:
+            assert child.subgraphs.nodes_array(p) is arrays[p]
+
+
+def test_graph_lookup_reads_node_attributes():
+    graph = Graph([(0, 1), (1, 2)])
+    for node in graph:
+        graph.nodes[node]["pop"] = node * 10
+    graph.nodes[2]["name"] = "two"
+    frozen = Partition(graph, {0: 0, 1: 0, 2: 1}).graph
+    assert [frozen.lookup(node, "pop") for node in graph] == [0, 10, 20]
+    assert frozen.lookup(2, "name") == "two"
+    with pytest.raises(KeyError):
+        frozen.lookup(0, "name")
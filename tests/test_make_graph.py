@@ -210,6 +210,22 @@ def test_from_file_and_then_to_json_with_geometries(shapefile, target_file):
     graph.to_json(target_file, include_geometries_as_geojson=True)
 
 
+def test_intersections_with_neighbors_match_direct_intersections(
+    geodataframe_with_boundary
+):
+    from gerrychain.graph.adjacency import intersections_with_neighbors
+
+    geometries = geodataframe_with_boundary.geometry.copy()
+    geometries[len(geometries)] = Polygon()
+    pairs = dict(intersections_with_neighbors(geometries))
+    assert set(pairs) == set(geometries.index)
+    assert pairs[len(geometries) - 1] == {}
+    for i, intersections in pairs.items():
+        for j, intersection in intersections.items():
+            assert intersection.equals(geometries[i].intersection(geometries[j]))
+            assert intersection.equals(pairs[j][i])
+
+
 def test_graph_warns_for_islands():
     graph = Graph()
     graph.add_node(0)
@@ -1,3 +1,5 @@
+import pytest
+import numpy
 from collections import defaultdict
 
 from gerrychain import MarkovChain, Partition, Graph
@@ -88,3 +90,111 @@ def test_works_when_no_flips_occur():
 
     for partition in chain:
         assert partition["pop"] == expected
+
+
+def test_data_tally_shared_between_graphs():
+    graph = Graph([(node, node + 1) for node in range(15)])
+    # The same nodes, but in the opposite order
+    other = Graph([(node, node - 1) for node in range(15, 0, -1)])
+    data = {node: node for node in graph.nodes}
+    tally = DataTally(data, alias="tally")
+    assignment = {node: 1 for node in graph.nodes}
+    assignment[0] = 2
+    partition = Partition(graph, assignment, {"tally": tally})
+    assert partition["tally"] == {1: 120, 2: 0}
+    other_partition = Partition(other, dict(assignment), {"tally": tally})
+    assert other_partition["tally"] == {1: 120, 2: 0}
+
+    new_partition = partition.flip({node: 2 for node in range(1, 11)})
+    assert new_partition["tally"] == {1: 65, 2: 55}
+
+
+def test_tally_skips_nan_values(three_by_three_grid):
+    for node in three_by_three_grid.nodes:
+        three_by_three_grid.nodes[node]["pop"] = 1
+    three_by_three_grid.nodes[0]["pop"] = float("nan")
+    assignment = {node: node % 2 for node in three_by_three_grid.nodes}
+    partition = Partition(
+        three_by_three_grid, assignment, {"pop": Tally("pop", alias="pop")}
+    )
+
+    with pytest.warns(UserWarning, match="ignoring 1 nan value"):
+        tally = partition["pop"]
+    assert tally == {0: 4, 1: 4}
+
+
+def test_data_tally_sums_large_flows(three_by_three_grid):
+    assignment = {node: 1 for node in three_by_three_grid.nodes}
+    assignment[0] = 2
+    data = {node: node for node in three_by_three_grid.nodes}
+    updaters = {"tally": DataTally(data, alias="tally")}
+    partition = Partition(three_by_three_grid, assignment, updaters)
+    assert partition["tally"] == {1: 36, 2: 0}
+
+    new_partition = partition.flip({node: 2 for node in range(1, 9) if node != 4})
+    assert new_partition["tally"] == {1: 4, 2: 32}
+    assert isinstance(new_partition["tally"][2], int)
+
+
+def test_tally_sums_large_flows_over_multiple_fields(three_by_three_grid):
+    for node in three_by_three_grid.nodes:
+        three_by_three_grid.nodes[node]["a"] = node
+        three_by_three_grid.nodes[node]["b"] = 1
+    assignment = {node: 1 for node in three_by_three_grid.nodes}
+    assignment[0] = 2
+    updaters = {"tally": Tally(["a", "b"], alias="tally")}
+    partition = Partition(three_by_three_grid, assignment, updaters)
+    assert partition["tally"] == {1: 44, 2: 1}
+
+    new_partition = partition.flip({node: 2 for node in range(1, 9) if node != 4})
+    assert new_partition["tally"] == {1: 5, 2: 40}
+
+
+def test_tally_warns_once_for_all_nan_values(three_by_three_grid):
+    for node in three_by_three_grid.nodes:
+        three_by_three_grid.nodes[node]["pop"] = float("nan") if node < 7 else 1
+    assignment = {node: node % 2 for node in three_by_three_grid.nodes}
+    partition = Partition(
+        three_by_three_grid, assignment, {"pop": Tally("pop", alias="pop")}
+    )
+
+    with pytest.warns(UserWarning) as record:
+        tally = partition["pop"]
+    assert len(record) == 1
+    assert "ignoring 7 nan value(s)" in str(record[0].message)
+    assert tally == {0: 1, 1: 1}
+
+
+def test_tally_with_narrow_column_dtype(three_by_three_grid):
+    for node in three_by_three_grid.nodes:
+        three_by_three_grid.nodes[node]["pop"] = 2_000_000_000
+    assignment = {node: 1 for node in three_by_three_grid.nodes}
+    assignment[0] = 2
+    tally = Tally("pop", alias="pop", column_dtype=numpy.int32)
+    partition = Partition(three_by_three_grid, assignment, {"pop": tally})
+    assert partition["pop"] == {1: 16_000_000_000, 2: 2_000_000_000}
+
+    new_partition = partition.flip({node: 2 for node in range(1, 9) if node != 4})
+    assert new_partition["pop"] == {1: 2_000_000_000, 2: 16_000_000_000}
+
+
+def test_tally_column_dtype_must_fit(three_by_three_grid):
+    for node in three_by_three_grid.nodes:
+        three_by_three_grid.nodes[node]["pop"] = 1 << 40
+    assignment = {node: 1 for node in three_by_three_grid.nodes}
+    tally = Tally("pop", alias="pop", column_dtype=numpy.int32)
+    partition = Partition(three_by_three_grid, assignment, {"pop": tally})
+    with pytest.raises(ValueError):
+        partition["pop"]
+
+
+def test_compute_flows_accept_a_single_field(three_by_three_grid):
+    from gerrychain.updaters.tally import compute_in_flow, compute_out_flow
+
+    for node in three_by_three_grid.nodes:
+        three_by_three_grid.nodes[node]["pop"] = node
+        three_by_three_grid.nodes[node]["area"] = 1
+    flow = {"in": {1, 2}, "out": {3}}
+    assert compute_in_flow(three_by_three_grid, "pop", flow) == 3
+    assert compute_in_flow(three_by_three_grid, ["pop", "area"], flow) == 5
+    assert compute_out_flow(three_by_three_grid, ["pop", "area"], flow) == 4
@@ -1,5 +1,12 @@
-from gerrychain import Partition
-from gerrychain.updaters import num_spanning_trees
+import math
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+import pytest
+
+from gerrychain import Graph, Partition
+from gerrychain.updaters import NumSpanningTrees, log_num_spanning_trees, num_spanning_trees
 
 
 def test_get_num_spanning_trees(three_by_three_grid):
@@ -11,3 +18,118 @@ def test_get_num_spanning_trees(three_by_three_grid):
     )
     assert 192 == round(partition["num_spanning_trees"][1])
     assert [1] == list(partition["num_spanning_trees"].keys())
+
+
+def test_get_num_spanning_trees_by_district(three_by_three_grid):
+    assignment = {0: 1, 1: 1, 2: 1, 3: 1, 4: 2, 5: 2, 6: 1, 7: 2, 8: 2}
+    partition = Partition(
+        three_by_three_grid,
+        assignment,
+        {"num_spanning_trees": num_spanning_trees}
+    )
+    assert 1 == round(partition["num_spanning_trees"][1])
+    assert 4 == round(partition["num_spanning_trees"][2])
+
+
+def test_get_num_spanning_trees_in_process_pool(three_by_three_grid):
+    assignment = {0: 1, 1: 1, 2: 1, 3: 1, 4: 2, 5: 2, 6: 1, 7: 2, 8: 2}
+    partition = Partition(three_by_three_grid, assignment)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        result = num_spanning_trees(partition, executor)
+    assert {1: 1, 2: 4} == {part: round(n) for part, n in result.items()}
+
+
+def test_num_spanning_trees_updater_keeps_its_process_pool(three_by_three_grid):
+    assignment = {0: 1, 1: 1, 2: 1, 3: 1, 4: 2, 5: 2, 6: 3, 7: 2, 8: 2}
+    updater = NumSpanningTrees(max_workers=2)
+    partition = Partition(three_by_three_grid, assignment, {"trees": updater})
+    assert {1: 1, 2: 4, 3: 1} == {part: round(n) for part, n in partition["trees"].items()}
+    executor = updater._executor
+    assert executor is not None
+
+    child = partition.flip({6: 1, 4: 1})
+    assert {1: 4, 2: 1, 3: 1} == {part: round(n) for part, n in child["trees"].items()}
+    assert updater._executor is executor
+
+    copy = pickle.loads(pickle.dumps(updater))
+    assert copy._executor is None
+    updater.shutdown()
+    assert updater._executor is None
+
+
+def test_log_num_spanning_trees_does_not_overflow():
+    graph = Graph.from_networkx(nx.grid_graph([40, 40]))
+    partition = Partition(graph, {node: 1 for node in graph.nodes})
+    log_count = log_num_spanning_trees(partition)[1]
+    assert log_count > 1000
+    assert math.inf == num_spanning_trees(partition)[1]
+
+
+def test_num_spanning_trees_of_disconnected_and_single_node_districts(three_by_three_grid):
+    assignment = {0: 1, 1: 2, 2: 1, 3: 2, 4: 2, 5: 2, 6: 2, 7: 2, 8: 3}
+    partition = Partition(three_by_three_grid, assignment)
+    result = num_spanning_trees(partition)
+    assert 0 == result[1]
+    assert 1 == round(result[3])
+
+
+def test_num_spanning_trees_of_large_disconnected_district():
+    graph = Graph.from_networkx(nx.grid_graph([8, 20]))
+    # District 1 is two 8x8 blocks on either side of district 2
+    assignment = {node: 2 if 8 <= node[0] < 12 else 1 for node in graph.nodes}
+    partition = Partition(graph, assignment)
+    assert 0 == num_spanning_trees(partition)[1]
+    assert -math.inf == log_num_spanning_trees(partition)[1]
+    assert log_num_spanning_trees(partition)[2] > 0
+
+
+def test_log_num_spanning_trees_slq_of_disconnected_district():
+    graph = Graph.from_networkx(nx.grid_graph([40, 60]))
+    assignment = {node: 2 if 25 <= node[0] < 35 else 1 for node in graph.nodes}
+    partition = Partition(graph, assignment)
+    assert -math.inf == log_num_spanning_trees(partition, method="slq")[1]
+
+
+def test_unknown_method_is_rejected_on_small_graph(three_by_three_grid):
+    partition = Partition(three_by_three_grid, {node: 1 for node in range(9)})
+    with pytest.raises(ValueError):
+        log_num_spanning_trees(partition, method="lu")
+    with pytest.raises(ValueError):
+        num_spanning_trees(partition, method="lu")
+    with pytest.raises(ValueError):
+        NumSpanningTrees(method="lu")
+
+
+def test_num_spanning_trees_uses_edge_weights():
+    graph = Graph.from_networkx(nx.cycle_graph(4))
+    for u, v in graph.edges:
+        graph.edges[u, v]["weight"] = 2
+    graph.add_edge(3, 4)
+    partition = Partition(graph, {0: 1, 1: 1, 2: 1, 3: 1, 4: 2})
+    # Each of the 4 spanning trees of the cycle has weight 2 ** 3
+    assert 32 == round(num_spanning_trees(partition)[1])
+    assert 1 == round(num_spanning_trees(partition)[2])
+
+
+def test_log_num_spanning_trees_slq_estimate_is_close():
+    graph = Graph.from_networkx(nx.grid_graph([40, 40]))
+    partition = Partition(graph, {node: 1 for node in graph.nodes})
+    exact = log_num_spanning_trees(partition)[1]
+    estimate = log_num_spanning_trees(partition, method="slq", probes=30)[1]
+    assert abs(estimate - exact) / exact < 0.02
+
+
+def test_num_spanning_trees_updater_reuses_unchanged_parts(three_by_three_grid):
+    assignment = {0: 1, 1: 1, 2: 1, 3: 1, 4: 2, 5: 2, 6: 3, 7: 2, 8: 2}
+    updater = NumSpanningTrees()
+    partition = Partition(three_by_three_grid, assignment, {"trees": updater})
+    assert {1: 1, 2: 4, 3: 1} == {part: round(n) for part, n in partition["trees"].items()}
+
+    cached = dict(updater._cache)
+    child = partition.flip({6: 1})
+    assert {1: 1, 2: 4, 3: 1} == {part: round(n) for part, n in child["trees"].items()}
+    assert updater._cache[2] is cached[2]
+    assert updater._cache[1] is not cached[1]
+
+    logs = NumSpanningTrees(log=True)(child)
+    assert math.log(4) == pytest.approx(logs[2])
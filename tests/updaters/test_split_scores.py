@@ -101,7 +101,63 @@ class TestSplittingScores:
         assert 32 > result["symmetric_entropy"] > 31 
         assert result["num_split_localities"] == 3
 
+    def test_scores_are_computed_lazily(self, partition, monkeypatch):
+        splits = partition.updaters["splits"]
+        calls = []
+        monkeypatch.setattr(
+            splits, "num_pieces", lambda p: calls.append("num_pieces") or 3
+        )
+        result = partition["splits"]
+        assert result["num_parts"] == 3
+        assert calls == []
+        assert result["num_pieces"] == 3
+        assert result["num_pieces"] == 3
+        assert calls == ["num_pieces"]
+        assert set(result) == set(splits.scores_to_compute)
+
+    def test_lazy_scores_survive_later_calls(self, partition):
+        result = partition["splits"]
+        child = partition.flip({1: 2, 4: 1})
+        child_result = child["splits"]
+        assert child_result["num_parts"] == 5
+        assert result["num_parts"] == 3
+        assert result["num_split_localities"] == 0
 
-
-
-
+    def test_reading_old_scores_leaves_splits_unchanged(self, partition):
+        splits = partition.updaters["splits"]
+        result = partition["splits"]
+        child = partition.flip({1: 2, 4: 1})
+        child["splits"]
+        child_splits = splits.locality_splits
+        child_splits_inv = splits.locality_splits_inv
+        assert result["shannon_entropy"] == 0
+        assert splits.locality_splits is child_splits
+        assert splits.locality_splits_inv is child_splits_inv
+
+    def test_scoring_a_child_of_an_unscored_parent(self, partition):
+        splits = partition.updaters["splits"]
+        child = partition.flip({1: 2, 4: 1})
+        result = child["splits"]
+        assert result["naked_boundary"] == 4
+        assert "splits" not in partition._cache
+        assert splits.scores is result
+        assert splits.locality_splits[1] == {"a": 2, "b": 1}
+        assert splits.locality_splits_inv["a"] == {1: 2, 2: 1}
+
+    def test_localitydict(self, partition):
+        partition["splits"]
+        splits = partition.updaters["splits"]
+        assert splits.localitydict == {
+            n: partition.graph.nodes[n]["county"] for n in partition.graph.nodes
+        }
+
+    def test_naked_boundary_updates_from_parent(self, partition):
+        assert partition["splits"]["naked_boundary"] == 0
+        child = partition.flip({1: 2, 4: 1})
+        assert child["splits"]["naked_boundary"] == 4
+        grandchild = child.flip({1: 1, 4: 2})
+        assert grandchild["splits"]["naked_boundary"] == 0
+        fresh = Partition(
+            child.graph, dict(child.assignment), updaters=dict(child.updaters)
+        )
+        assert fresh["splits"]["naked_boundary"] == 4
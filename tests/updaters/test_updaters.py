@@ -297,3 +297,31 @@ def expected_tally(partition, column):
         part: sum(partition.graph.nodes[node][column] for node in nodes)
         for part, nodes in partition.parts.items()
     }
+
+
+def test_flow_positions_group_flowing_nodes_by_part_and_side(three_by_three_grid):
+    from gerrychain.updaters.flows import flow_positions
+
+    assignment = {node: 1 if node < 5 else 2 for node in three_by_three_grid.nodes}
+    partition = Partition(three_by_three_grid, assignment)
+    child = partition.flip({3: 2, 4: 2, 5: 1})
+
+    positions, segments, parts = flow_positions(child)
+    node_index = child.graph.node_index()
+    for i, part in enumerate(parts):
+        for j, side in enumerate(("in", "out")):
+            expected = {node_index[node] for node in child.flows[part][side]}
+            assert set(positions[segments == 2 * i + j].tolist()) == expected
+
+
+def test_neighbor_flips_returns_an_immutable_cached_set(three_by_three_grid):
+    from gerrychain.updaters.flows import neighbor_flips
+
+    assignment = {node: 1 if node < 5 else 2 for node in three_by_three_grid.nodes}
+    partition = Partition(three_by_three_grid, assignment)
+    child = partition.flip({4: 2})
+
+    edges = neighbor_flips(child)
+    assert edges == {(1, 4), (3, 4), (4, 5), (4, 7)}
+    assert isinstance(edges, frozenset)
+    assert neighbor_flips(child) is edges